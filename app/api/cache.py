@@ -0,0 +1,64 @@
+"""
+In-process cache of serialized API responses.
+"""
+
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi.responses import Response
+
+
+class ResponseCache:
+    """Bounded LRU cache of JSON response bodies."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get a cached body, marking it as most recently used."""
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        """Cache a body, evicting the least recently used entry when full."""
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached bodies (e.g. if the data store is ever reloaded)."""
+        self._entries.clear()
+
+
+# Global response cache instance
+response_cache = ResponseCache()
+
+
+def cache_response(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Cache an async route handler's successful JSON responses.
+
+    Responses are keyed on the handler name and its parsed arguments, so
+    equivalent requests (e.g. with reordered query parameters) share an entry.
+    Only use this on handlers whose response depends solely on their arguments;
+    the data store is static after load, so no expiry is needed.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(**kwargs: Any) -> Any:
+        key = (func.__name__, tuple(sorted(kwargs.items())))
+        body = response_cache.get(key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+        response = await func(**kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            response_cache.set(key, bytes(response.body))
+        return response
+
+    return wrapper
@@ -6,7 +6,10 @@ from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
 
+from app.api.cache import cache_response
 from app.models.schemas import (
     MarketOverviewResponse,
     MarketPropertiesResponse,
@@ -18,8 +21,25 @@ from app.services.data_loader import DataStore, get_data_store
 router = APIRouter(prefix="/api", tags=["CRE Analytics"])
 
 
-@router.get("/markets/{market_id}", response_model=MarketOverviewResponse)
-def get_market_overview(
+class ModelResponse(Response):
+    """
+    JSON response rendered directly from a pydantic model.
+
+    Returning a Response skips FastAPI's response_model revalidation and
+    jsonable_encoder pass; the model is serialized once by pydantic-core.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode("utf-8")
+
+
+# Response schemas are declared via `responses` so they stay in the OpenAPI docs
+# without response_model validation
+@router.get("/markets/{market_id}", responses={200: {"model": MarketOverviewResponse}})
+@cache_response
+async def get_market_overview(
     market_id: int,
     start_date: Optional[date] = Query(None, description="Start date for performance history"),
     end_date: Optional[date] = Query(None, description="End date for performance history"),
@@ -54,26 +74,28 @@ def get_market_overview(
     # Calculate trends
     trends = None
     if include_trends:
-        # Use all available data for trend calculation
-        all_performance = market.performance
-        trends = analytics_service.calculate_market_trends(all_performance)
-
-    return MarketOverviewResponse(
-        market_id=market.market_id,
-        market_name=market.market_name,
-        city=market.city,
-        state=market.state,
-        market_type=market.market_type,
-        latest_performance=latest_performance,
-        trends=trends,
-        performance_history=performance_history,
+        trends = data_store.get_market_trends(market_id)
+
+    return ModelResponse(
+        MarketOverviewResponse(
+            market_id=market.market_id,
+            market_name=market.market_name,
+            city=market.city,
+            state=market.state,
+            market_type=market.market_type,
+            latest_performance=latest_performance,
+            trends=trends,
+            performance_history=performance_history,
+        )
     )
 
 
 @router.get(
-    "/properties/{property_id}/market-performance", response_model=PropertyMarketPerformanceResponse
+    "/properties/{property_id}/market-performance",
+    responses={200: {"model": PropertyMarketPerformanceResponse}},
 )
-def get_property_market_performance(
+@cache_response
+async def get_property_market_performance(
     property_id: int, data_store: DataStore = Depends(get_data_store)
 ):
     """
@@ -99,16 +121,19 @@ def get_property_market_performance(
     # Generate summary
     performance_summary = analytics_service.generate_performance_summary(variance_analysis)
 
-    return PropertyMarketPerformanceResponse(
-        property=property_,
-        market_benchmark=market_benchmark,
-        variance_analysis=variance_analysis,
-        overall_performance_summary=performance_summary,
+    return ModelResponse(
+        PropertyMarketPerformanceResponse(
+            property=property_,
+            market_benchmark=market_benchmark,
+            variance_analysis=variance_analysis,
+            overall_performance_summary=performance_summary,
+        )
     )
 
 
-@router.get("/markets/{market_id}/properties", response_model=MarketPropertiesResponse)
-def get_market_properties(
+@router.get("/markets/{market_id}/properties", responses={200: {"model": MarketPropertiesResponse}})
+@cache_response
+async def get_market_properties(
     market_id: int,
     sort_by: Optional[str] = Query(
         None, description="Sort by: occupancy_variance, rent_variance, property_name"
@@ -129,6 +154,10 @@ def get_market_properties(
     - **offset**: Number of results to skip for pagination
     - **property_class**: Filter by property class (A, B, C)
     """
+    # Normalize case-insensitive query params once
+    descending = sort_order.lower() == "desc"
+    pc_upper = property_class.upper() if property_class else None
+
     market = data_store.get_market(market_id)
     if not market:
         raise HTTPException(status_code=404, detail=f"Market {market_id} not found")
@@ -139,56 +168,36 @@ def get_market_properties(
             status_code=404, detail=f"No performance data found for market {market_id}"
         )
 
-    # Get all properties in the market
-    properties = data_store.get_market_properties(market_id)
-
-    # Apply property class filter
-    if property_class:
-        properties = [p for p in properties if p.property_class.upper() == property_class.upper()]
-
-    # Create property summaries
-    property_summaries = [
-        analytics_service.create_property_summary(prop, market_benchmark) for prop in properties
-    ]
-
-    # Sort
-    if sort_by == "occupancy_variance":
-        property_summaries.sort(
-            key=lambda x: x.occupancy_vs_market
-            if x.occupancy_vs_market is not None
-            else float("-inf"),
-            reverse=(sort_order.lower() == "desc"),
-        )
-    elif sort_by == "rent_variance":
-        property_summaries.sort(
-            key=lambda x: x.rent_vs_market if x.rent_vs_market is not None else float("-inf"),
-            reverse=(sort_order.lower() == "desc"),
-        )
-    elif sort_by == "property_name":
-        property_summaries.sort(
-            key=lambda x: x.property_name, reverse=(sort_order.lower() == "desc")
-        )
+    # Get precomputed summaries for the market (or property class), presorted if requested
+    property_summaries = data_store.get_sorted_market_property_summaries(
+        market_id,
+        sort_by,
+        descending=descending,
+        property_class=pc_upper,
+    )
 
     # Pagination
     total_count = len(property_summaries)
     paginated_properties = property_summaries[offset : offset + limit]
 
-    return MarketPropertiesResponse(
-        market_id=market.market_id,
-        market_name=market.market_name,
-        market_benchmark=market_benchmark,
-        properties=paginated_properties,
-        total_count=total_count,
-        pagination={
-            "limit": limit,
-            "offset": offset,
-            "total": total_count,
-            "has_more": offset + limit < total_count,
-        },
+    return ModelResponse(
+        MarketPropertiesResponse(
+            market_id=market.market_id,
+            market_name=market.market_name,
+            market_benchmark=market_benchmark,
+            properties=paginated_properties,
+            total_count=total_count,
+            pagination={
+                "limit": limit,
+                "offset": offset,
+                "total": total_count,
+                "has_more": offset + limit < total_count,
+            },
+        )
     )
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "CRE Analytics API"}
@@ -113,3 +113,13 @@ class MarketPropertiesResponse(BaseModel):
     properties: List[PropertySummary]
     total_count: int
     pagination: dict
+
+
+# Make sure response schemas are fully built at import rather than on first request
+# (pydantic builds them at class creation; this raises early if a model is ever deferred)
+for _response_model in (
+    MarketOverviewResponse,
+    PropertyMarketPerformanceResponse,
+    MarketPropertiesResponse,
+):
+    _response_model.model_rebuild(raise_errors=True)
@@ -2,8 +2,12 @@
 Analytics service for calculating performance metrics and comparisons.
 """
 
+import math
+from collections import Counter
 from typing import List, Optional, Tuple
 
+import numpy as np
+
 from app.models.schemas import (
     MarketPerformance,
     MarketTrend,
@@ -12,13 +16,43 @@ from app.models.schemas import (
     PropertySummary,
 )
 
+# Trend metric names and the MarketPerformance fields they are calculated from
+TREND_METRICS = (
+    ("rent_per_sqft", "avg_rent_per_sqft"),
+    ("occupancy_rate", "avg_occupancy_rate"),
+    ("renewal_rate", "renewal_rate"),
+    ("lease_term_months", "avg_lease_term_months"),
+)
+
+# Performance indicators indexed by variance band: below, within and above the
+# 5% "at-market" threshold
+PERFORMANCE_INDICATORS = ("underperforming", "at-market", "outperforming")
+INVERTED_PERFORMANCE_INDICATORS = PERFORMANCE_INDICATORS[::-1]
+
 
 class AnalyticsService:
-    """Service for calculating analytical metrics."""
+    """
+    Service for calculating analytical metrics.
+
+    Result models are built with model_construct: their inputs are already
+    validated models, so re-running pydantic validation is wasted work.
+    """
+
+    @staticmethod
+    def classify_variance(variance_pct: float, invert: bool = False) -> str:
+        """
+        Classify a variance percentage as a performance indicator.
+
+        Set invert for metrics where a lower value is better.
+        """
+        # Using 5% threshold for "at-market" classification; the band index is
+        # 0 (<= -5), 1 (within 5) or 2 (>= 5)
+        band = 1 + (variance_pct >= 5) - (variance_pct <= -5)
+        return (INVERTED_PERFORMANCE_INDICATORS if invert else PERFORMANCE_INDICATORS)[band]
 
     @staticmethod
     def calculate_variance(
-        property_value: Optional[float], market_value: float
+        property_value: Optional[float], market_value: float, invert: bool = False
     ) -> Tuple[Optional[float], str]:
         """
         Calculate variance percentage and performance indicator.
@@ -31,16 +65,7 @@ class AnalyticsService:
 
         variance_pct = ((property_value - market_value) / market_value) * 100
 
-        # Determine performance indicator based on variance
-        # Using 5% threshold for "at-market" classification
-        if abs(variance_pct) < 5:
-            indicator = "at-market"
-        elif variance_pct > 0:
-            indicator = "outperforming"
-        else:
-            indicator = "underperforming"
-
-        return variance_pct, indicator
+        return variance_pct, AnalyticsService.classify_variance(variance_pct, invert)
 
     @staticmethod
     def analyze_property_performance(
@@ -51,14 +76,15 @@ class AnalyticsService:
 
         Returns list of variance analyses for each metric.
         """
+        calc = AnalyticsService.calculate_variance
         variances = []
 
         # Occupancy rate
-        variance_pct, indicator = AnalyticsService.calculate_variance(
+        variance_pct, indicator = calc(
             property_.current_occupancy_rate, market_benchmark.avg_occupancy_rate
         )
         variances.append(
-            PerformanceVariance(
+            PerformanceVariance.model_construct(
                 metric_name="occupancy_rate",
                 property_value=property_.current_occupancy_rate,
                 market_value=market_benchmark.avg_occupancy_rate,
@@ -68,11 +94,11 @@ class AnalyticsService:
         )
 
         # Rent per sqft
-        variance_pct, indicator = AnalyticsService.calculate_variance(
+        variance_pct, indicator = calc(
             property_.current_avg_rent_per_sqft, market_benchmark.avg_rent_per_sqft
         )
         variances.append(
-            PerformanceVariance(
+            PerformanceVariance.model_construct(
                 metric_name="rent_per_sqft",
                 property_value=property_.current_avg_rent_per_sqft,
                 market_value=market_benchmark.avg_rent_per_sqft,
@@ -82,11 +108,9 @@ class AnalyticsService:
         )
 
         # Renewal rate
-        variance_pct, indicator = AnalyticsService.calculate_variance(
-            property_.renewal_rate_ytd, market_benchmark.renewal_rate
-        )
+        variance_pct, indicator = calc(property_.renewal_rate_ytd, market_benchmark.renewal_rate)
         variances.append(
-            PerformanceVariance(
+            PerformanceVariance.model_construct(
                 metric_name="renewal_rate",
                 property_value=property_.renewal_rate_ytd,
                 market_value=market_benchmark.renewal_rate,
@@ -96,12 +120,12 @@ class AnalyticsService:
         )
 
         # Lease term
-        variance_pct, indicator = AnalyticsService.calculate_variance(
+        variance_pct, indicator = calc(
             float(property_.avg_lease_term_months) if property_.avg_lease_term_months else None,
             float(market_benchmark.avg_lease_term_months),
         )
         variances.append(
-            PerformanceVariance(
+            PerformanceVariance.model_construct(
                 metric_name="lease_term_months",
                 property_value=float(property_.avg_lease_term_months)
                 if property_.avg_lease_term_months
@@ -113,18 +137,15 @@ class AnalyticsService:
         )
 
         # Time to lease
-        variance_pct, indicator = AnalyticsService.calculate_variance(
+        # Note: Lower time to lease is better, so we invert the indicator
+        variance_pct, indicator = calc(
             float(property_.avg_time_to_lease_days) if property_.avg_time_to_lease_days else None,
             float(market_benchmark.avg_time_to_lease_days),
+            invert=True,
         )
-        # Note: Lower time to lease is better, so we invert the indicator
-        if indicator == "outperforming":
-            indicator = "underperforming"
-        elif indicator == "underperforming":
-            indicator = "outperforming"
 
         variances.append(
-            PerformanceVariance(
+            PerformanceVariance.model_construct(
                 metric_name="time_to_lease_days",
                 property_value=float(property_.avg_time_to_lease_days)
                 if property_.avg_time_to_lease_days
@@ -140,139 +161,140 @@ class AnalyticsService:
     @staticmethod
     def generate_performance_summary(variances: List[PerformanceVariance]) -> str:
         """Generate a text summary of overall property performance."""
-        # Count performance indicators (excluding no-data)
-        indicators = [
+        # Count performance indicators (excluding no-data) in a single pass
+        indicator_counts = Counter(
             v.performance_indicator for v in variances if v.performance_indicator != "no-data"
-        ]
+        )
+        total = sum(indicator_counts.values())
 
-        if not indicators:
+        if not total:
             return "Insufficient data to determine overall performance"
 
-        outperforming_count = indicators.count("outperforming")
-        underperforming_count = indicators.count("underperforming")
-        at_market_count = indicators.count("at-market")
+        outperforming_count = indicator_counts["outperforming"]
+        underperforming_count = indicator_counts["underperforming"]
+        at_market_count = indicator_counts["at-market"]
 
         # Simple majority voting
         if outperforming_count > underperforming_count and outperforming_count > at_market_count:
-            return f"Property is generally outperforming the market ({outperforming_count}/{len(indicators)} metrics above market)"
+            return f"Property is generally outperforming the market ({outperforming_count}/{total} metrics above market)"
         elif (
             underperforming_count > outperforming_count and underperforming_count > at_market_count
         ):
-            return f"Property is generally underperforming the market ({underperforming_count}/{len(indicators)} metrics below market)"
+            return f"Property is generally underperforming the market ({underperforming_count}/{total} metrics below market)"
         elif at_market_count > outperforming_count and at_market_count > underperforming_count:
-            return f"Property is performing at market levels ({at_market_count}/{len(indicators)} metrics at market)"
+            return f"Property is performing at market levels ({at_market_count}/{total} metrics at market)"
         else:
             # Mixed performance - no clear majority
             return f"Property has mixed performance (outperforming: {outperforming_count}, at-market: {at_market_count}, underperforming: {underperforming_count})"
 
     @staticmethod
-    def calculate_market_trends(performance_history: List[MarketPerformance]) -> List[MarketTrend]:
+    def calculate_market_trends(
+        latest: MarketPerformance, previous: Optional[MarketPerformance]
+    ) -> List[MarketTrend]:
         """
-        Calculate trends from historical performance data.
+        Calculate trends from the latest and previous performance periods.
 
         Compares latest value to previous period (MoM).
         """
-        if len(performance_history) < 2:
+        if previous is None:
             return []
 
-        latest = performance_history[-1]
-        previous = performance_history[-2]
-
-        trends = []
+        return AnalyticsService._calculate_trends_from_arrays(
+            np.array([getattr(latest, field) for _, field in TREND_METRICS], dtype=np.float64),
+            np.array([getattr(previous, field) for _, field in TREND_METRICS], dtype=np.float64),
+        )
 
-        # Helper function to create trend
-        def create_trend(name: str, latest_val: float, prev_val: float) -> MarketTrend:
-            change_pct = ((latest_val - prev_val) / prev_val) * 100 if prev_val != 0 else 0
+    @staticmethod
+    def _calculate_trends_from_arrays(
+        latest_values: np.ndarray, previous_values: np.ndarray
+    ) -> List[MarketTrend]:
+        """
+        Calculate trends from latest and previous metric values.
 
-            if abs(change_pct) < 1:
-                direction = "stable"
-            elif change_pct > 0:
-                direction = "up"
-            else:
-                direction = "down"
+        Both arrays hold one value per TREND_METRICS entry, in the same order.
+        """
+        change = np.divide(
+            latest_values - previous_values,
+            previous_values,
+            out=np.zeros_like(previous_values),
+            where=previous_values != 0,
+        )
+        change *= 100
+        directions = np.select([np.abs(change) < 1, change > 0], ["stable", "up"], default="down")
 
-            return MarketTrend(
+        return [
+            MarketTrend.model_construct(
                 metric_name=name,
                 latest_value=latest_val,
                 previous_value=prev_val,
                 change_percentage=round(change_pct, 2),
                 trend_direction=direction,
             )
+            for (name, _), latest_val, prev_val, change_pct, direction in zip(
+                TREND_METRICS,
+                latest_values.tolist(),
+                previous_values.tolist(),
+                change.tolist(),
+                directions.tolist(),
+            )
+        ]
 
-        trends.append(
-            create_trend("rent_per_sqft", latest.avg_rent_per_sqft, previous.avg_rent_per_sqft)
-        )
-        trends.append(
-            create_trend("occupancy_rate", latest.avg_occupancy_rate, previous.avg_occupancy_rate)
+    @staticmethod
+    def create_property_summaries(
+        properties: List[Property], market_benchmark: MarketPerformance
+    ) -> List[PropertySummary]:
+        """
+        Create performance summaries for a batch of properties in one market.
+
+        Variances are calculated over column arrays of the batch, with missing
+        (or zero) metrics carried as NaN.
+        """
+        occupancy = np.array(
+            [p.current_occupancy_rate or np.nan for p in properties], dtype=np.float64
         )
-        trends.append(create_trend("renewal_rate", latest.renewal_rate, previous.renewal_rate))
-        trends.append(
-            create_trend(
-                "lease_term_months",
-                float(latest.avg_lease_term_months),
-                float(previous.avg_lease_term_months),
-            )
+        rent = np.array(
+            [p.current_avg_rent_per_sqft or np.nan for p in properties], dtype=np.float64
         )
 
-        return trends
+        # Calculate key variances, rounded with Python's round() to match scalar results
+        market_occupancy = market_benchmark.avg_occupancy_rate
+        market_rent = market_benchmark.avg_rent_per_sqft
+        occupancy_variance = [
+            round(v, 2)
+            for v in (((occupancy - market_occupancy) / market_occupancy) * 100).tolist()
+        ]
+        rent_variance = [round(v, 2) for v in (((rent - market_rent) / market_rent) * 100).tolist()]
+        has_occupancy = [not math.isnan(v) for v in occupancy_variance]
+        has_rent = [not math.isnan(v) for v in rent_variance]
 
-    @staticmethod
-    def create_property_summary(
-        property_: Property, market_benchmark: MarketPerformance
-    ) -> PropertySummary:
-        """Create a summary of property performance for multi-asset views."""
-        # Calculate key variances
-        occupancy_variance = None
-        rent_variance = None
-
-        if property_.current_occupancy_rate:
-            occupancy_variance = round(
-                (
-                    (property_.current_occupancy_rate - market_benchmark.avg_occupancy_rate)
-                    / market_benchmark.avg_occupancy_rate
+        summaries = []
+        for property_, occ_var, rent_var, has_occ, has_rent_var in zip(
+            properties, occupancy_variance, rent_variance, has_occupancy, has_rent
+        ):
+            # Determine overall performance (weighted towards occupancy and rent)
+            if has_occ and has_rent_var:
+                overall_performance = AnalyticsService.classify_variance((occ_var + rent_var) / 2)
+            elif has_occ or has_rent_var:
+                overall_performance = AnalyticsService.classify_variance(
+                    occ_var if has_occ else rent_var
                 )
-                * 100,
-                2,
-            )
-
-        if property_.current_avg_rent_per_sqft:
-            rent_variance = round(
-                (
-                    (property_.current_avg_rent_per_sqft - market_benchmark.avg_rent_per_sqft)
-                    / market_benchmark.avg_rent_per_sqft
+            else:
+                overall_performance = "insufficient-data"
+
+            summaries.append(
+                PropertySummary.model_construct(
+                    property_id=property_.id,
+                    property_name=property_.name,
+                    property_class=property_.property_class,
+                    current_occupancy_rate=property_.current_occupancy_rate,
+                    current_avg_rent_per_sqft=property_.current_avg_rent_per_sqft,
+                    occupancy_vs_market=occ_var if has_occ else None,
+                    rent_vs_market=rent_var if has_rent_var else None,
+                    overall_performance=overall_performance,
                 )
-                * 100,
-                2,
             )
 
-        # Determine overall performance (weighted towards occupancy and rent)
-        performance_scores = []
-        if occupancy_variance is not None:
-            performance_scores.append(occupancy_variance)
-        if rent_variance is not None:
-            performance_scores.append(rent_variance)
-
-        if performance_scores:
-            avg_variance = sum(performance_scores) / len(performance_scores)
-            if abs(avg_variance) < 5:
-                overall_performance = "at-market"
-            elif avg_variance > 0:
-                overall_performance = "outperforming"
-            else:
-                overall_performance = "underperforming"
-        else:
-            overall_performance = "insufficient-data"
-
-        return PropertySummary(
-            property_id=property_.id,
-            property_name=property_.name,
-            property_class=property_.property_class,
-            current_occupancy_rate=property_.current_occupancy_rate,
-            current_avg_rent_per_sqft=property_.current_avg_rent_per_sqft,
-            occupancy_vs_market=occupancy_variance,
-            rent_vs_market=rent_variance,
-            overall_performance=overall_performance,
-        )
+        return summaries
 
 
 analytics_service = AnalyticsService()
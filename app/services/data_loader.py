@@ -2,12 +2,32 @@
 Data loader service for loading and accessing market and property data.
 """
 
-import json
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from app.models.schemas import Market, MarketPerformance, Property
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.schemas import Market, MarketPerformance, MarketTrend, Property, PropertySummary
+from app.services.analytics import analytics_service
+
+# Validate whole files in one pydantic-core call (ISO date strings are parsed natively)
+MARKET_LIST_ADAPTER = TypeAdapter(List[Market])
+PROPERTY_LIST_ADAPTER = TypeAdapter(List[Property])
+
+# Sort keys for property summaries; missing variances sort as lowest
+SUMMARY_SORT_KEYS: Dict[str, Callable[[PropertySummary], Any]] = {
+    "occupancy_variance": lambda x: (
+        x.occupancy_vs_market if x.occupancy_vs_market is not None else float("-inf")
+    ),
+    "rent_variance": lambda x: x.rent_vs_market if x.rent_vs_market is not None else float("-inf"),
+    "property_name": lambda x: x.property_name,
+}
+
+# (market_id, property_class) key for summary lookups
+SummaryKey = Tuple[int, Optional[str]]
 
 
 class DataStore:
@@ -16,6 +36,14 @@ class DataStore:
     def __init__(self):
         self.markets: Dict[int, Market] = {}
         self.properties: Dict[int, Property] = {}
+        self.market_properties: Dict[int, List[Property]] = {}
+        self.market_perf_dates: Dict[int, np.ndarray] = {}
+        self.latest_performance: Dict[int, Optional[MarketPerformance]] = {}
+        self.market_trends: Dict[int, List[MarketTrend]] = {}
+        # Summary lookups are keyed by (market_id, property_class); a class of None
+        # holds every property in the market
+        self.market_property_summaries: Dict[SummaryKey, List[PropertySummary]] = {}
+        self.sorted_summaries: Dict[SummaryKey, Dict[str, List[PropertySummary]]] = {}
         self._load_data()
 
     def _load_data(self):
@@ -23,22 +51,57 @@ class DataStore:
         base_path = Path(__file__).parent.parent.parent / "data"
 
         # Load market data
-        with open(base_path / "market_data.json") as f:
-            market_data = json.load(f)
-            for market_dict in market_data:
-                # Convert date strings to date objects
-                for perf in market_dict["performance"]:
-                    perf["date"] = datetime.strptime(perf["date"], "%Y-%m-%d").date()
-
-                market = Market(**market_dict)
-                self.markets[market.market_id] = market
+        market_data = orjson.loads((base_path / "market_data.json").read_bytes())
+        for market in MARKET_LIST_ADAPTER.validate_python(market_data):
+            self.markets[market.market_id] = market
+            # Performance data is already sorted by date in the JSON
+            performance = market.performance
+            self.market_perf_dates[market.market_id] = np.array(
+                [p.date for p in performance], dtype="datetime64[D]"
+            )
+            latest = performance[-1] if performance else None
+            self.latest_performance[market.market_id] = latest
+            # Data is static after load, so trends only need computing once
+            if latest is not None:
+                previous = performance[-2] if len(performance) >= 2 else None
+                self.market_trends[market.market_id] = analytics_service.calculate_market_trends(
+                    latest, previous
+                )
 
         # Load property data
-        with open(base_path / "property_data.json") as f:
-            property_data = json.load(f)
-            for prop_dict in property_data:
-                prop = Property(**prop_dict)
-                self.properties[prop.id] = prop
+        property_data = orjson.loads((base_path / "property_data.json").read_bytes())
+        for prop in PROPERTY_LIST_ADAPTER.validate_python(property_data):
+            self.properties[prop.id] = prop
+            self.market_properties.setdefault(prop.market_id, []).append(prop)
+
+        # Summaries depend only on static property data and market benchmarks
+        # (rebuild these if data reloading is ever added)
+        for market_id in self.markets:
+            market_benchmark = self.latest_performance[market_id]
+            if market_benchmark is None:
+                continue
+            summaries = analytics_service.create_property_summaries(
+                self.get_market_properties(market_id), market_benchmark
+            )
+            self.market_property_summaries[(market_id, None)] = summaries
+            for summary in summaries:
+                self.market_property_summaries.setdefault(
+                    (market_id, summary.property_class.upper()), []
+                ).append(summary)
+
+        for key, summaries in self.market_property_summaries.items():
+            self.sorted_summaries[key] = self._build_sorted_summaries(summaries)
+
+    @staticmethod
+    def _build_sorted_summaries(
+        summaries: List[PropertySummary],
+    ) -> Dict[str, List[PropertySummary]]:
+        """Presort summaries by every sortable key, keyed as '<sort_by>_<asc|desc>'."""
+        sorted_variants = {}
+        for sort_by, key in SUMMARY_SORT_KEYS.items():
+            sorted_variants[f"{sort_by}_asc"] = sorted(summaries, key=key)
+            sorted_variants[f"{sort_by}_desc"] = sorted(summaries, key=key, reverse=True)
+        return sorted_variants
 
     def get_market(self, market_id: int) -> Optional[Market]:
         """Get market by ID."""
@@ -50,16 +113,35 @@ class DataStore:
 
     def get_market_properties(self, market_id: int) -> List[Property]:
         """Get all properties in a market."""
-        return [prop for prop in self.properties.values() if prop.market_id == market_id]
+        return self.market_properties.get(market_id, [])
+
+    def get_sorted_market_property_summaries(
+        self,
+        market_id: int,
+        sort_by: Optional[str],
+        descending: bool,
+        property_class: Optional[str] = None,
+    ) -> List[PropertySummary]:
+        """
+        Get a market's property summaries presorted by the given key.
+
+        property_class must already be upper-cased (None for all classes). Falls
+        back to the unsorted summaries when sort_by is not a sortable key.
+        """
+        key = (market_id, property_class)
+        order = "desc" if descending else "asc"
+        sorted_variants = self.sorted_summaries.get(key, {})
+        return sorted_variants.get(
+            f"{sort_by}_{order}", self.market_property_summaries.get(key, [])
+        )
 
     def get_latest_market_performance(self, market_id: int) -> Optional[MarketPerformance]:
         """Get the latest performance data for a market."""
-        market = self.get_market(market_id)
-        if not market or not market.performance:
-            return None
+        return self.latest_performance.get(market_id)
 
-        # Performance data is already sorted by date in the JSON
-        return market.performance[-1]
+    def get_market_trends(self, market_id: int) -> List[MarketTrend]:
+        """Get the precomputed trend analysis for a market."""
+        return self.market_trends.get(market_id, [])
 
     def get_market_performance_range(
         self, market_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None
@@ -69,15 +151,16 @@ class DataStore:
         if not market:
             return []
 
-        performance_data = market.performance
-
-        if start_date:
-            performance_data = [p for p in performance_data if p.date >= start_date]
-
-        if end_date:
-            performance_data = [p for p in performance_data if p.date <= end_date]
+        # Performance data is sorted by date, so the range is a contiguous slice
+        dates = self.market_perf_dates[market_id]
+        lo = np.searchsorted(dates, np.datetime64(start_date, "D")) if start_date else 0
+        hi = (
+            np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+            if end_date
+            else len(dates)
+        )
 
-        return performance_data
+        return market.performance[lo:hi]
 
     def get_all_markets(self) -> List[Market]:
         """Get all markets."""
@@ -88,6 +171,6 @@ class DataStore:
 data_store = DataStore()
 
 
-def get_data_store() -> DataStore:
+async def get_data_store() -> DataStore:
     """Dependency injection function for FastAPI."""
     return data_store
@@ -5,7 +5,7 @@ Main FastAPI application for Commercial Real Estate Analytics API.
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.routes import router
@@ -17,6 +17,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -70,7 +71,7 @@ async def general_exception_handler(request, exc):
 
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint with API information."""
     return {
         "service": "Commercial Real Estate Analytics API",